@@ -1,11 +1,12 @@
 # -*- coding: utf-8 -*-
 
 import lazygantt as lg
-import os
+from pathlib import Path
 
-PATH_MINIMAL_GANTT = os.path.join(os.path.curdir, 'files', 'minimal_gantt.csv')
-PATH_GANTT = os.path.join(os.path.curdir, 'files', 'gantt.csv')
-PATH_CONFIG = os.path.join(os.path.curdir, 'files', 'config.yaml')
+PATH_FILES = Path('files')
+PATH_MINIMAL_GANTT = PATH_FILES / 'minimal_gantt.csv'
+PATH_GANTT = PATH_FILES / 'gantt.csv'
+PATH_CONFIG = PATH_FILES / 'config.yaml'
 
 def default_gantt():
     """Creates a generic gantt chart fully from default values and saves
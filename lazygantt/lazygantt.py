@@ -4,10 +4,252 @@ Created on Thu Mar  4 10:25:39 2021
 
 @author: Loreen
 """
+import os
+import contextlib
+import functools
+import importlib.util
 import pandas as pd
 import numpy as np
 from .visuals import Chart
 
+# copy-on-write avoids defensive copies of the narrow dataframes in
+# _fill_from_csv; it is always enabled from pandas 3.0 on, which deprecates
+# the option, and unknown before pandas 1.5
+_PANDAS_VERSION = tuple(int(v) for v in pd.__version__.split('.')[:2])
+_TOGGLE_COPY_ON_WRITE = (1, 5) <= _PANDAS_VERSION < (3, 0)
+
+# numba is optional and imported on first use only, since loading it slows
+# down importing lazygantt
+HAS_NUMBA = importlib.util.find_spec('numba') is not None
+
+# number of packages from which on the compiled kernel outweighs the time
+# to load it, smaller data is processed by NumPy
+_NUMBA_MIN_ROWS = 1_000_000
+
+
+def _copy_on_write():
+    """Returns a context enabling copy-on-write only within lazygantt
+    
+    The option is not set globally, since it changes the behavior of 
+    chained assignments in pandas code of users.
+    """
+    if _TOGGLE_COPY_ON_WRITE:
+        return pd.option_context('mode.copy_on_write', True)
+    return contextlib.nullcontext()
+
+
+def _process_arrays(starts, durations, phases_assigned):
+    """Composes total duration, packages and phases in a single pass
+    
+    Fused counterpart of the NumPy routines in LazyGantt._fill_from_csv and
+    LazyGantt._compose_phases, compiled by numba for large data, see
+    _compiled_process_arrays.
+    
+    Parameters
+    ----------
+    starts : array-like
+        starting months of packages
+    durations : array-like
+        duration of packages in months
+    phases_assigned : array-like
+        phase numbers of packages, empty if no phase data is available
+
+    Returns
+    -------
+    no_months : int
+        number of total months of the project
+    packages : array-like
+        array in shape of number of packages x 2 that holds starting and
+        ending month of each package
+    no_phases : int
+        number of changes in phase numbering, counting the first package,
+        0 if phases_assigned holds less than 2 phases
+    phases : array-like
+        array in shape of no_phases x 2 that holds starting and ending month
+        of each phase
+    """
+    n = starts.shape[0]
+    has_phases = phases_assigned.shape[0] > 0
+    packages = np.empty((n, 2), dtype=starts.dtype)
+    i_last = 0
+    no_phases = 0
+    for i in range(n):
+        packages[i, 0] = starts[i]
+        packages[i, 1] = starts[i] + durations[i]
+        # first package with the latest start, as argmax
+        if starts[i] > starts[i_last]:
+            i_last = i
+        if has_phases and (i == 0 or 
+                           phases_assigned[i] != phases_assigned[i-1]):
+            no_phases += 1
+    no_months = starts[i_last] + durations[i_last]
+    
+    # phases column contains more than 1 phase?
+    if no_phases < 2:
+        no_phases = 0
+    phases = np.zeros((no_phases, 2), dtype=starts.dtype)
+    if no_phases == 0:
+        return no_months, packages, no_phases, phases
+    
+    # a phase starts with its first package and ends with the end of the
+    # first package of the following phase, see LazyGantt._compose_phases
+    j = 0
+    for i in range(n):
+        if i == 0 or phases_assigned[i] != phases_assigned[i-1]:
+            if j > 0:
+                phases[j-1, 1] = starts[i] + durations[i]
+            phases[j, 0] = starts[i]
+            j += 1
+    # close last phase with total amount of available months
+    phases[no_phases-1, 1] = no_months
+    return no_months, packages, no_phases, phases
+
+
+@functools.lru_cache(maxsize=None)
+def _compiled_process_arrays():
+    """Returns _process_arrays compiled by numba, or None without numba
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True)(_process_arrays)
+
+
+def _read_csv(filepath, sep, columns, int_columns):
+    """Parses processed columns of a csv file
+    
+    Parameters
+    ----------
+    filepath : str, path object or file-like object
+        name and path to file to load
+    sep : str
+        delimiter that separates columns in csv file
+    columns : tuple of str
+        columns that are parsed, if present in the csv file, all other 
+        columns are skipped by the parser
+    int_columns : tuple of str
+        columns that are parsed as nullable integers
+
+    Returns
+    -------
+    data : pandas Dataframe
+        content of csv file
+    """
+    # streams that cannot be rewound (e.g. pipes or stdin) are parsed in a
+    # single pass, leaving types to inference as DataColumnChecker expects
+    seekable = hasattr(filepath, 'seekable') and filepath.seekable()
+    if hasattr(filepath, 'read') and not seekable:
+        return pd.read_csv(filepath, sep=sep, 
+                           usecols=lambda col: col in columns)
+    
+    # peek at the header, rewinding file-like objects afterwards
+    position = filepath.tell() if seekable else None
+    header = pd.read_csv(filepath, sep=sep, nrows=0).columns
+    if position is not None:
+        filepath.seek(position)
+    usecols = [col for col in header if col in columns]
+    
+    # nullable integers keep rows without package data parseable until
+    # they are dropped in _fill_from_csv; optional columns are left to
+    # type inference, so that DataColumnChecker may still ignore them
+    dtype = {col: 'Int32' for col in int_columns if col in usecols}
+    try:
+        return _parse_csv(filepath, sep, usecols, dtype)
+    except ValueError:
+        # columns that cannot be cast, e.g. holding text, are parsed again
+        # by type inference, so that DataColumnChecker reports them
+        if position is not None:
+            filepath.seek(position)
+        return _parse_csv(filepath, sep, usecols, None)
+
+
+def _parse_csv(filepath, sep, usecols, dtype):
+    """Parses a csv file by pyarrow, if installed, or by pandas' default
+    
+    pyarrow only supports single-character delimiters, all others (e.g.
+    regular expressions) are left to pandas, which chooses the C engine or
+    falls back to the python engine.
+    """
+    if sep is not None and len(sep) == 1:
+        try:
+            return pd.read_csv(filepath, sep=sep, usecols=usecols, 
+                               dtype=dtype, engine='pyarrow')
+        except ImportError:
+            pass
+    return pd.read_csv(filepath, sep=sep, usecols=usecols, dtype=dtype)
+
+
+@functools.lru_cache(maxsize=8)
+def _read_csv_cached(filepath, mtime_ns, sep, columns, int_columns):
+    """Parses a csv file once per modification time
+    
+    mtime_ns is only part of the cache key, so that a modified file is 
+    parsed again. Returned dataframes must not be mutated.
+    """
+    return _read_csv(filepath, sep, columns, int_columns)
+
+
+def _low_bits(n):
+    """Returns uint64 words with their lowest n bits set, 0 <= n <= 64
+    """
+    # shifting by the full word width is undefined, handle it separately
+    full = (n >= 64)
+    shift = np.where(full, 0, n).astype(np.uint64)
+    low_bits = np.left_shift(np.uint64(1), shift) - np.uint64(1)
+    return np.where(full, np.uint64(np.iinfo(np.uint64).max), low_bits)
+
+
+def _interval_words(arr):
+    """Converts intervals within the first 64 months to uint64 bitmasks
+    
+    Parameters
+    ----------
+    arr : array-like
+        Array in shape of number of temporal representatives (packages, 
+        phases) x 2 (for starting and ending point in time)
+
+    Returns
+    -------
+    words : array-like
+        Array of dtype uint64 in shape of number of temporal 
+        representatives x 1, holding set bits where packages or phases are
+        present, with the lowest bit denoting the earliest month
+    """
+    months = np.clip(arr, 0, 64)
+    return _low_bits(months[:, 1:2]) & ~_low_bits(months[:, 0:1])
+
+
+@functools.lru_cache(maxsize=8)
+def _make_interval_kernel(no_months):
+    """Builds a function converting intervals to slots for plotting
+    
+    Projects of up to 64 months are converted to a single uint64 bitmask
+    per row by _interval_words. Longer projects are converted to a boolean
+    array by LazyGantt._to_boolean_array, sharing a row of months that is
+    allocated only once per project length.
+    
+    Parameters
+    ----------
+    no_months : int
+        number of total months of the project
+
+    Returns
+    -------
+    kernel : callable
+        function that takes an array in shape of number of temporal 
+        representatives x 2 and returns slots as accepted by 
+        Chart.plot_gantt
+    """
+    if no_months <= 64:
+        return _interval_words
+    
+    int_type = np.int16 if no_months <= np.iinfo(np.int16).max else np.int32
+    months_axis = np.arange(no_months, dtype=int_type)[None, :]
+    return functools.partial(LazyGantt._to_boolean_array,
+                             months_axis=months_axis)
+
+
 class LazyGantt(object):
     """A class used to represent data characteristics of a Gantt Chart
     
@@ -90,18 +332,22 @@ class LazyGantt(object):
                         [ 5,12],
                         [12,18],
                         [17,24],
-                        [19,24]], dtype=np.int)
+                        [19,24]], dtype=np.int16)
         # array with shape no_phases x no_months
         self.phases = np.array([
                         [ 0 ,6],
                         [ 6,16],
-                        [16,24]], dtype=np.int)
-        self.milestones = np.array(milestones) if milestones is not None \
-                                            else np.array([5, 8, 14, 19, 22])
+                        [16,24]], dtype=np.int16)
+        # milestones are few and may exceed the project duration, keep them
+        # wide until they are filtered
+        self.milestones = np.array(milestones, dtype=np.int64) \
+                          if milestones is not None \
+                          else np.array([5, 8, 14, 19, 22], dtype=np.int64)
         self.chart = Chart()
         
         if data is not None:
-            self._fill_from_csv(data)
+            with _copy_on_write():
+                self._fill_from_csv(data)
             if milestones is not None:
                 self._filter_milestones()
         
@@ -123,10 +369,26 @@ class LazyGantt(object):
         data : numpy Dataframe
             data necessary for creation of a Gantt chart
         """
-        data = pd.read_csv(filepath, sep=sep, engine='python')
-        return cls(data, milestones)
+        columns = tuple(cls.ALL_COLUMNS)
+        int_columns = tuple(cls.MANDATORY_COLUMNS)
+        with _copy_on_write():
+            try:
+                # absolute path keeps the cache valid after changing 
+                # directories
+                path = os.path.abspath(filepath)
+                mtime_ns = os.stat(path).st_mtime_ns
+            except (TypeError, ValueError, OSError):
+                # file-like objects and URLs cannot be cached, they are 
+                # passed to pandas as they are
+                data = _read_csv(filepath, sep, columns, int_columns)
+            else:
+                # copy protects the cached dataframe from later 
+                # modifications
+                data = _read_csv_cached(path, mtime_ns, sep,
+                                        columns, int_columns).copy()
+            return cls(data, milestones)
     
-    def load_config(self, filepath):
+    def load_config(self, filepath, use_cache=True):
         """Loads a configuration file
         
         Loads a configuration file for adapting visual appearance and 
@@ -136,18 +398,23 @@ class LazyGantt(object):
         ----------
         filepath : str, path object or file-like object
             name and path to file to load
+        use_cache : bool, optional
+            re-use configuration parsed before from the same, unchanged 
+            file. The default is True.
         """
         
-        self.chart.load_config(filepath)
+        self.chart.load_config(filepath, use_cache)
         
     def plot(self):
         """Plots data
         
         Prepares array-like data for plotting and passes data for plotting
         """
-        packages = self._to_boolean_array(self.packages, self.no_months)
-        phases = self._to_boolean_array(self.phases, self.no_months)
-        self.chart.plot_gantt(packages, phases, self.milestones)
+        kernel = _make_interval_kernel(self.no_months)
+        packages = kernel(self.packages)
+        phases = kernel(self.phases) if self.phases is not None else None
+        self.chart.plot_gantt(packages, phases, self.milestones,
+                              x_range=self.no_months)
 
     def _fill_from_csv(self, data):
         """Fills class variables from data parsed from csv file
@@ -180,43 +447,76 @@ class LazyGantt(object):
         ## filtering data rows
         # delete cells where no starting month is stated (NAN values)
         # to remove rows without package data
-        nan_rows = data[data[key_mapper['start']].isnull()].index.values
-        data.drop(nan_rows, inplace=True)
+        mask = data[key_mapper['start']].notna().to_numpy()
+        # contiguous index for label-based access further below
+        data = data.loc[mask].reset_index(drop=True)
 
         ## datatype conversion
-        for k in key_mapper.keys():
-            data[key_mapper[k]] = data[key_mapper[k]].astype('int32')
+        # narrowest integer type that holds the ending months of all
+        # packages, with int16 sufficing for projects up to 2700 years, and
+        # the phase numbers, which are cast to the same type
+        max_value = (data[key_mapper['start']].max() +
+                     data[key_mapper['length']].max())
+        if 'phase' in key_mapper:
+            phases_assigned = data[key_mapper['phase']]
+            max_value = max(max_value, phases_assigned.max(),
+                            -phases_assigned.min())
+        int_type = next(t for t in (np.int16, np.int32, np.int64)
+                        if max_value <= np.iinfo(t).max)
+        # cast all processed columns in a single call
+        data = data.astype({key_mapper[k]: int_type for k in key_mapper})
+        # work on NumPy views of the columns from here on
+        cols = {k: data[v].to_numpy(copy=False)
+                for k, v in key_mapper.items()}
+        starts = cols['start']
+        durations = cols['length']
+        pa = cols.get('phase')
+        
+        # only possible with sufficient cleaning
+        self.no_packages = data.index.max()
+        
+        # compiled kernel only pays off for large data
+        kernel = (_compiled_process_arrays() 
+                  if HAS_NUMBA and len(starts) > _NUMBA_MIN_ROWS else None)
+        if kernel is not None:
+            ## total duration, packages and phases
+            # fused into a single pass by the compiled kernel
+            no_months, self.packages, no_phases, phases = kernel(
+                                    starts, durations,
+                                    pa if pa is not None else starts[:0])
+            self.no_months = int(no_months)
+            if pa is None:
+                self.no_phases = None
+                self.phases = None
+            elif no_phases > 0:
+                self.no_phases = int(no_phases)
+                self.phases = phases
+            return
         
         ## total duration
         # not explicitely stated and not straightforward to calculate due to 
         # the possibility for overlapping packages: 
         # compose from last package plus the duration of this last package
-        last_package_start = data[key_mapper['start']].max()
-        last_package_duration = data.at[data[key_mapper['start']].idxmax(),
-                                        key_mapper['length']]
-        self.no_months = last_package_start + last_package_duration
+        i = int(starts.argmax())
+        self.no_months = int(starts[i] + durations[i])
         
         ## packages
-        # only possible with sufficient cleaning
-        self.no_packages = data.index.max()
-        packages_start = data[key_mapper['start']].values[:]
-        packages_duration = data[key_mapper['length']].values[:]
-        self.packages = np.asarray((packages_start,
-                                   packages_start+packages_duration)).T
+        self.packages = np.stack((starts, starts + durations), axis=1)
         
         ## phases
-        if 'phase' not in key_mapper:
+        if pa is None:
             self.no_phases = None
             self.phases = None
         else:
-            # phases column contains more than 1 number (i.e. phase)?
-            if len(data[key_mapper['phase']].unique()) > 1:
-                data[key_mapper[k]] = data[key_mapper[k]].astype('int32')
-                self.no_phases = data[key_mapper['phase']].max()
-                self.phases = self._compose_phases(
-                                        data[key_mapper['phase']],
-                                        data[key_mapper['start']],
-                                        data[key_mapper['length']])
+            # find changes of numbering in phases, prepending a value 
+            # differing from the first phase number marks the first package
+            # as a change
+            idx_phase_change = np.flatnonzero(np.diff(pa, prepend=pa[0]-1))
+            # phases column contains more than 1 phase?
+            if idx_phase_change.size > 1:
+                self.no_phases = idx_phase_change.size
+                self.phases = self._compose_phases(idx_phase_change,
+                                                   starts, durations)
     
     def _build_key_mapper(self, key_mapper, string):
         """Builds a mapping dictionary to access data column names
@@ -246,7 +546,7 @@ class LazyGantt(object):
         return key_mapper
     
     def _compose_phases(self, 
-                        phases_assigned,
+                        idx_phase_change,
                         months_started,
                         months_lasting):
         """
@@ -262,7 +562,8 @@ class LazyGantt(object):
         
         Phases are composed as in the following:
         (a) Search for changes in phases' assigned numbering by using forward 
-        differentiation and save indices of phase changes.
+        differentiation and save indices of phase changes (done by the 
+        caller, since the number of changes decides on phases at all).
         (b) Re-use indices to assemble starting and ending months of phases:
             (1) starting months: collect start values of all first 
                 included packages per phase
@@ -271,12 +572,12 @@ class LazyGantt(object):
         
         Parameters
         ----------
-        phases_assigned
-            Pandas series holding phase numbers
+        idx_phase_change
+            array holding indices of the first package of each phase
         months_started
-            Pandas series holding starting months of packages
+            array holding starting months of packages
         months_lasting
-            Pandas series holding duration of packages
+            array holding duration of packages
         
         Returns
         -------
@@ -285,11 +586,11 @@ class LazyGantt(object):
             ending month of each phase
         
         Example:
-        >>> print(phases_assigned.values[:])
-        [1 1 1 1 2 2 3 3 4 4 5 5 5 5 6 6 7 7]
-        >>> print(months_started.values[:])
+        >>> print(idx_phase_change)
+        [ 0  4  6  8 10 14 16]
+        >>> print(months_started)
         [ 0  3  4  5  6  8 12 16 20 24 27 28 32 35 38 41 44 46]
-        >>> print(months_lasting.values[:])
+        >>> print(months_lasting)
         [ 3  6 17  3 14  4  9  9  5  5 14  5  8  5  6  4  3  2]
         >>> arr = self._compose_phases
         >>> print(arr)
@@ -303,16 +604,15 @@ class LazyGantt(object):
         
         """
         
-        phases = np.zeros((self.no_phases, 2), dtype=int)
+        ms = np.asarray(months_started)
+        ml = np.asarray(months_lasting)
+        phases = np.zeros((len(idx_phase_change), 2), dtype=ms.dtype)
 
-        # find changes of numbering in phases
-        idx_phase_change = phases_assigned.diff()[
-                                phases_assigned.diff() != 0].index.values[:]
         # fill phase starts
-        phases[:, 0] = months_started[idx_phase_change].values
+        phases[:, 0] = ms[idx_phase_change]
         # fill phase lengths, except for last phase, which is closed by hand
-        phases[:-1, 1] = (months_started[idx_phase_change[1:]].values+
-                          months_lasting[idx_phase_change[1:]].values)
+        phases[:-1, 1] = (ms[idx_phase_change[1:]]+
+                          ml[idx_phase_change[1:]])
         # close last phase with total amount of available months
         phases[-1, 1] = self.no_months
         return phases
@@ -320,27 +620,26 @@ class LazyGantt(object):
     def _filter_milestones(self):
         """Filters milestones that exceed project duration or are negative
         """
-        too_small = (self.milestones < 0)
-        if np.sum(too_small) > 0:
+        m = self.milestones
+        too_small = (m < 0)
+        too_big = (m > self.no_months)
+        if too_small.any():
             print("Values for milestones are negative: {}"
-                  .format(self.milestones[too_small]))
-            ix_huge_enough = np.nonzero(~too_small)
-            self.milestones = self.milestones[ix_huge_enough]
-        
-        too_big = (self.milestones > self.no_months)
-        if np.sum(too_big) > 0:
+                  .format(m[too_small]))
+        if too_big.any():
             print("Values for milestones exceed total length of project of " \
                   "{max} and are filtered: {values}" .format(
-                      max=self.no_months, 
-                      values= self.milestones[np.nonzero(too_big)]))
-            # get indicies where condition too_big is not True
-            ix_small_enough = np.nonzero(~too_big)
-            self.milestones = self.milestones[ix_small_enough]
+                      max=self.no_months,
+                      values=m[too_big]))
+        # keep only milestones that fulfill both conditions, single pass
+        bad = too_small | too_big
+        self.milestones = m[~bad]
 
-    def _to_boolean_array(self, arr, x_range):
-        """Converts array to matrix in shape of len(arr) X x_range
+    @staticmethod
+    def _to_boolean_array(arr, months_axis):
+        """Converts array to matrix in shape of len(arr) X len(months)
         
-        Converts array to matrix in shape of len(arr) X x_range
+        Converts array to matrix in shape of len(arr) X len(months)
         
         Parameters
         ----------
@@ -348,8 +647,10 @@ class LazyGantt(object):
             Array in shape of number of temporal representatives (packages, 
             phases) x 2 (for starting and ending point in time)
             Example: 7 packages, 12 months project duration -> shape 7 x 2
-        x_range : int
-            The number of columns of the new array.
+        months_axis : array-like
+            Row vector of months in shape of 1 x number of total months,
+            i.e. np.arange(no_months)[None, :]. May be reused for all 
+            conversions of a project.
 
         Returns
         -------
@@ -362,16 +663,15 @@ class LazyGantt(object):
         """
         
         if arr is None:
-            pass
-        else:
-            y_range = len(arr)
-            boolean_arr = np.reshape(np.full(y_range*x_range, 
-                                    fill_value=False, dtype=bool),
-                                    newshape=(y_range,self.no_months))
-            for i in range(len(arr)):
-                boolean_arr[i, arr[i, 0]:arr[i, 1]] = True
-            
-            return boolean_arr
+            return None
+
+        # compare each month against starting and ending points of all
+        # representatives at once: row vector of months (1 x no_months) is
+        # broadcasted against column vectors of starts and ends (len(arr) x 1)
+        starts = arr[:, 0:1]
+        ends = arr[:, 1:2]
+        boolean_arr = (months_axis >= starts) & (months_axis < ends)
+        return boolean_arr
 
 
 class DataColumnChecker(object):
@@ -393,8 +693,9 @@ class DataColumnChecker(object):
         list of column names which are mandatory to be valid. If they are not
         valid, an exception is thrown.
         Optional.
-    conditions : dict
-        dictionary that holds routines to check for valid columns
+    conditions : list of tuple
+        list of names and routines to check for valid columns, ordered from
+        cheapest to most expensive check
     
     """
     
@@ -408,9 +709,11 @@ class DataColumnChecker(object):
         self.target_columns = target_columns
         self.mandatory_columns = mandatory_columns if mandatory_columns \
                                  is not None else list()
-        self.conditions = {'existent_column': self._check_existence,
-                           'content_in_column': self._check_content,
-                           'string_in_column': self._check_for_strings}
+        # existence and data type are checked before the content, which
+        # requires a scan of the column
+        self.conditions = [('existent_column', self._check_existence),
+                           ('string_in_column', self._check_for_strings),
+                           ('content_in_column', self._check_content)]
         self._filter_for_valid_columns(data)
     
     def get_valid_columns(self):
@@ -442,25 +745,48 @@ class DataColumnChecker(object):
         
         """
         
-        for column in self.target_columns:
-            for key, value in self.conditions.items():
-                # processes cascade of conditions
-                is_valid, message = self.conditions[key](column, data)
-                if is_valid:
-                    pass
-                else:
-                    # throw exception only if there is a problem with mandatory
-                    # columns
-                    if column in self.mandatory_columns:
-                        raise Exception(
-                            "Mandatory column cannot be processed! " \
-                            "{}" .format(message))
-                        
-                    # remove all optional columns that did not fulfilled all
-                    # conditions
-                    self.target_columns.remove(column)
-                    print(message)
-                    break
+        # rebuild list instead of removing invalid columns while iterating
+        self.target_columns = [column for column in self.target_columns
+                               if self._is_valid(column, data)]
+
+    def _is_valid(self, column, data):
+        """Checks a single column against the cascade of conditions
+        
+        Parameters
+        ----------
+        column : str
+            name of the column
+        data : pandas dataframe
+            data for creation of a Gantt chart containing data columns
+
+        Returns
+        -------
+        the return value : bool
+            True if all conditions are fulfilled, False otherwise.
+
+        Raises
+        ------
+        Exception
+            If a mandatory column does not fulfill all conditions.
+        
+        """
+        
+        for _, condition in self.conditions:
+            # processes cascade of conditions
+            is_valid, message = condition(column, data)
+            if not is_valid:
+                # throw exception only if there is a problem with mandatory
+                # columns
+                if column in self.mandatory_columns:
+                    raise Exception(
+                        "Mandatory column cannot be processed! " \
+                        "{}" .format(message))
+                
+                # optional columns that did not fulfill all conditions are
+                # ignored
+                print(message)
+                return False
+        return True
 
     def _check_existence(self, column, data):
         """Checks for the existence of a column within a dataframe
@@ -505,7 +831,8 @@ class DataColumnChecker(object):
             description of result of validation 
 
         """
-        if not data[column].isnull().values.all():
+        # stops at the first non-empty cell
+        if data[column].notna().any():
             return (True, "Column '{}' contains content." .format(column))
         else:
             message = ("Column '{}' is ignored, since it is empty!" .format(
@@ -536,4 +863,4 @@ class DataColumnChecker(object):
         else:
             message = ("Column '{}' is ignored, since it holds text instead " \
                   "of numeric data!" .format(column))
-            return (False, message)
\ No newline at end of file
+            return (False, message)
\ No newline at end of file
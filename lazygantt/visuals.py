@@ -4,13 +4,87 @@ Created on Thu Mar 11 15:31:50 2021
 
 @author: Loreen
 """
+import os
+import io
+import copy
+import functools
+import importlib.util
 import yaml
 import numpy as np
 
-import matplotlib.pyplot as plt
+import matplotlib as mpl
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.colors import LinearSegmentedColormap
 import matplotlib.colors as mcolors
-from mpl_toolkits.axes_grid1 import ImageGrid
+
+# C implementation of the yaml parser, if PyYAML was built with libyaml
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# numba is optional and imported on first use only, since loading it slows
+# down importing lazygantt
+HAS_NUMBA = importlib.util.find_spec('numba') is not None
+
+# parsed configuration files, absolute path -> (st_mtime_ns, st_size, config)
+_YAML_CACHE = {}
+
+# color names accepted in config files
+_CSS4 = frozenset(mcolors.CSS4_COLORS)
+
+# position of lowest set bit for each byte value, 0 for an empty byte
+_FIRST_SET_LUT = np.array([(v & -v).bit_length() - 1 if v else 0
+                           for v in range(256)], dtype=np.int8)
+
+@functools.lru_cache(maxsize=None)
+def _first_true_kernel():
+    """Returns compiled kernel finding the first slot per row
+    
+    Rows of wide slot arrays are scanned in parallel, stopping at the first 
+    slot instead of reducing the whole row. numba is loaded on the first 
+    call, None is returned without numba.
+    """
+    try:
+        from numba import njit, prange
+    except ImportError:
+        return None
+
+    @njit(parallel=True, cache=True, boundscheck=False)
+    def first_true_per_row(data, out):
+        for r in prange(data.shape[0]):
+            first = -1
+            for c in range(data.shape[1]):
+                if data[r, c]:
+                    first = c
+                    break
+            out[r] = first
+    return first_true_per_row
+
+# colormaps shared by all charts, ('white', color name) -> colormap
+_CMAP_CACHE = {}
+
+def _get_cmap(color_name):
+    """Returns colormap from white to a color, created once per process
+
+    Parameters
+    ----------
+    color_name : str
+        name of color as accepted by matplotlib
+
+    Returns
+    -------
+    cmap : matplotlib.colors.LinearSegmentedColormap
+        colormap from white to the color
+    """
+    key = ('white', color_name)
+    cmap = _CMAP_CACHE.get(key)
+    if cmap is None:
+        cmap = LinearSegmentedColormap.from_list(
+                                'mycmap_'+color_name, list(key), N=256)
+        _CMAP_CACHE[key] = cmap
+    return cmap
 
 class Chart(object):
     """A class to plot charts
@@ -31,6 +105,8 @@ class Chart(object):
     labels: dict
         dictonary that hold mainly axis labels
     """
+    # fixed set of attributes, instances need no __dict__
+    __slots__ = ('colors', 'image', 'font', 'milestones', 'labels')
     
     def __init__(self, config=None):
         self.colors = {'primary': 'steelblue',
@@ -41,7 +117,8 @@ class Chart(object):
                       'height': 10,
                       'aspect': 1.,
                       'dpi': 150,
-                      'format': 'png'}
+                      'format': 'png',
+                      'png_compress_level': 1}
         self.milestones = {'linewidth': 2.5}
         self.labels = {'package_abbr': 'WP',
                        'package_ylabel': 'Work Packages',
@@ -54,7 +131,7 @@ class Chart(object):
         if config is not None:
             self._process_config(config)
     
-    def load_config(self, filepath):
+    def load_config(self, filepath, use_cache=True):
         """
         Loads configuration file
 
@@ -62,10 +139,32 @@ class Chart(object):
         ----------
         filepath : str, path object or file-like object
             name and path to file to load
+        use_cache : bool, optional
+            re-use configuration parsed before from the same file, as long as
+            its modification time and size are unchanged. File-like objects
+            are never cached. The default is True.
         """
         
-        config = yaml.safe_load(open(filepath))
-        self._process_config(config)
+        try:
+            stat = os.stat(filepath)
+        except TypeError:
+            # file-like object
+            self._process_config(yaml.load(filepath, Loader=_YamlLoader))
+            return
+        
+        key = os.path.abspath(filepath)
+        cached = _YAML_CACHE.get(key) if use_cache else None
+        if cached is not None and cached[:2] == (stat.st_mtime_ns,
+                                                 stat.st_size):
+            config = cached[2]
+        else:
+            # libyaml consumes bytes without decoding them in python first
+            with open(filepath, 'rb') as f:
+                config = yaml.load(f, Loader=_YamlLoader)
+            _YAML_CACHE[key] = (stat.st_mtime_ns, stat.st_size, config)
+        # class variables hold parts of the config, which must not alter
+        # the cached one
+        self._process_config(copy.deepcopy(config))
         
     def _process_config(self, config):
         """Updates class variables with data from config file
@@ -75,108 +174,213 @@ class Chart(object):
         config : dict
             dictionary that hold data from a yaml file
 
+        Raises
+        ------
+        ValueError
+            If colors are not named as in matplotlib.colors.CSS4_COLORS.
+
         """
         
         # test for colors following the naming conventions of matplotlib
-        for k, v in config['colors'].items():
-            try:
-                mcolors.CSS4_COLORS[v]
-            except KeyError:
-                print("Color stated for '%s' does not exist! \
-                      Choose color from: '%s'" % 
-                      (k, list(mcolors.CSS4_COLORS.keys())))
-            else:
-                self.colors[k] = v
+        bad = [(k, v) for k, v in config['colors'].items() if v not in _CSS4]
+        if bad:
+            raise ValueError("Colors stated for {} do not exist! Choose " \
+                             "colors from matplotlib.colors.CSS4_COLORS."
+                             .format(bad))
+        self.colors.update(config['colors'])
         
         self.image = config['image']
         self.font = config['font']
         self.milestones = config['milestones']
         self.labels = config['labels']
         
-    def plot_gantt(self, main_slots, voluntary_slots=None, events=None):
+    def plot_gantt(self, main_slots, voluntary_slots=None, events=None,
+                   x_range=None, bitpacked=False, close_fig=True):
         """Plots Gantt chart
         
         Parameters
         ----------
         main_slots : array-like
             array in shape of number of packages x number of total months,
-            filled with True values when packages are present
+            filled with True values when packages are present.
+            Alternatively, bit-packed array of dtype uint64 in shape of 
+            number of packages x ceil(number of total months / 64), or of 
+            dtype uint8 as from np.packbits(..., axis=1, bitorder='little')
         voluntary_slots : array-like, optional
             array in shape of number of phases x number of total months,
-            filled with True values when phases are present
+            filled with True values when phases are present.
+            Alternatively, bit-packed as main_slots.
         events : list, optional
             list of integers after how many months event occured
+        x_range : int, optional
+            number of total months, mandatory for bit-packed slots
+        bitpacked : bool, optional
+            whether slots of dtype uint8 are bit-packed. The default is 
+            False.
+        close_fig : bool, optional
+            whether figure is cleared after saving, which releases its 
+            artists and image buffers. The default is True.
+
+        Returns
+        -------
+        fig : matplotlib.figure.Figure
+            saved figure, or None if it was closed
+
+        Raises
+        ------
+        ValueError
+            If slots are bit-packed, but x_range is not given.
 
         """
+        # padding bits of bit-packed slots would be plotted as months
+        if x_range is None and any(
+                slots is not None and 
+                self._packed_bytes(slots, bitpacked) is not None
+                for slots in (main_slots, voluntary_slots)):
+            raise ValueError("x_range is mandatory for bit-packed slots!")
         
         ## font settings
-        font = {'weight' : 'normal',
-                'size'   : self.font['fontsize']}
-        plt.rc('font', **font)
-        
-        ## label settings
-        xlabel = self.labels['xlabel']
-        xticks_steps = self.labels['xticks_steps']
+        # applied to this figure only instead of changing global rcParams
+        font = {'font.weight': 'normal',
+                'font.size': self.font['fontsize']}
+        with mpl.rc_context(font):
+            ## label settings
+            xlabel = self.labels['xlabel']
+            xticks_steps = self.labels['xticks_steps']
 
-        ## image settings
-        fig = plt.figure(figsize=(self.image['width'],
-                                  self.image['height']))
-        aspect = self.image['aspect']
+            ## image settings
+            # rasterized artists are rendered in the resolution of the 
+            # figure, which is drawn by Agg directly without registering it
+            # in pyplot's figure manager
+            fig = Figure(figsize=(self.image['width'],
+                                  self.image['height']),
+                         dpi=self.image['dpi'])
+            FigureCanvasAgg(fig)
+            aspect = self.image['aspect']
         
-        # creates list of arguments for plotting function
-        primary_slots = [main_slots, 
-                   events,
-                   'primary', 
-                   self.labels['package_abbr'], 
-                   self.labels['package_ylabel'], 
-                   xlabel,
-                   aspect,
-                   xticks_steps]
-        secondary_slots = [voluntary_slots, 
-                     events,
-                     'secondary', 
-                     self.labels['phase_abbr'],
-                     self.labels['phase_ylabel'], 
-                     xlabel,
-                     aspect,
-                     xticks_steps]
-        event_visuals = [events, 
-                    'contrast', 
-                    self.labels['milestones_abbr'],
-                    self.milestones['linewidth']]
+            # creates list of arguments for plotting function
+            primary_slots = [main_slots, 
+                       events,
+                       'primary', 
+                       self.labels['package_abbr'], 
+                       self.labels['package_ylabel'], 
+                       xlabel,
+                       aspect,
+                       xticks_steps]
+            secondary_slots = [voluntary_slots, 
+                         events,
+                         'secondary', 
+                         self.labels['phase_abbr'],
+                         self.labels['phase_ylabel'], 
+                         xlabel,
+                         aspect,
+                         xticks_steps]
+            event_visuals = [events, 
+                        'contrast', 
+                        self.labels['milestones_abbr'],
+                        self.milestones['linewidth']]
         
-        # dynamically set number of subplots
-        if voluntary_slots is not None:
-            subplots = (2, 1)
-        else:
-            subplots = (1, 1)
+            # dynamically set number of subplots, heights are proportional
+            # to number of rows to keep the same cell size in all subplots
+            if voluntary_slots is not None:
+                subplots = 2
+                height_ratios = [np.shape(voluntary_slots)[0], 
+                                 np.shape(main_slots)[0]]
+            else:
+                subplots = 1
+                height_ratios = [1]
         
-        # create image grid with number of subplots
-        axes = ImageGrid(fig, 
-                         111,  # similar to subplot(111)
-                         nrows_ncols=subplots,
-                         axes_pad=0.1,  # pad between axes in inch
-                         )
+            # create plain subplots sharing the months axis, aspect is kept
+            # by imshow
+            axes = fig.subplots(subplots, 1, sharex=True, 
+                                gridspec_kw={'hspace': 0.1,
+                                             'height_ratios': height_ratios})
+            if subplots == 1:
+                axes = [axes]
         
-        # append axes object for correct plotting position
-        if voluntary_slots is not None:
-            primary_slots.append(axes[1])
-            secondary_slots.append(axes[0])
-            event_visuals.extend([True, axes[1]])
-        else:
-            primary_slots.append(axes[0])
+            # append axes object for correct plotting position
+            if voluntary_slots is not None:
+                primary_slots.append(axes[1])
+                secondary_slots.append(axes[0])
+                event_visuals.extend([True, axes[1]])
+            else:
+                primary_slots.append(axes[0])
+                event_visuals.extend([True, axes[0]])
         
-        # pass plotting arguments to plot slots
-        self._plot_slots(*primary_slots)
-        self._plot_slots(*secondary_slots)
-        self._plot_events(*event_visuals)
-        # self._plot_events(**tertiary.append(False, axes[0]))
+            # pass plotting arguments to plot slots
+            self._plot_slots(*primary_slots, x_range=x_range, 
+                             bitpacked=bitpacked)
+            self._plot_slots(*secondary_slots, x_range=x_range, 
+                             bitpacked=bitpacked)
+            if events is not None and len(events) > 0:
+                self._plot_events(*event_visuals)
+            # only the bottom subplot shows the months axis
+            for ax in axes:
+                ax.label_outer()
+            # self._plot_events(**tertiary.append(False, axes[0]))
         
-        ## image handling
-        fig.savefig('gantt.'+self.image['format'], 
-                    dpi=self.image['dpi'],
-                    format=self.image['format'])
-        # plt.close(fig)
+            ## image handling
+            # fast zlib level for png, since Gantt charts compress well anyway
+            save_kwargs = {}
+            if self.image['format'] == 'png':
+                save_kwargs['pil_kwargs'] = {
+                    'compress_level': self.image.get('png_compress_level', 1),
+                    'optimize': False}
+            # figure is encoded once into memory and written in one go
+            buffer = io.BytesIO()
+            fig.savefig(buffer, 
+                        dpi=self.image['dpi'],
+                        format=self.image['format'],
+                        **save_kwargs)
+            with open('gantt.'+self.image['format'], 'wb') as f:
+                f.write(buffer.getbuffer())
+
+        # figure is not registered in pyplot, so clearing it drops all 
+        # references to artists at once instead of waiting for the gc
+        if close_fig:
+            fig.clear()
+            return None
+        return fig
+    
+    def _packed_bytes(self, slots, bitpacked=False):
+        """Returns bytes of bit-packed slots
+
+        Parameters
+        ----------
+        slots : array-like
+            array of slots, either boolean, uint64 words with word k holding
+            time slots 64*k up to 64*k+63 (lowest bit first), or uint8 as
+            from np.packbits(..., axis=1, bitorder='little')
+        bitpacked : bool, optional
+            whether uint8 slots are bit-packed
+
+        Returns
+        -------
+        packed : array-like
+            uint8 array with lowest bit of each byte holding the earliest 
+            time slot, or None if slots are not bit-packed
+        """
+        if slots.dtype == np.uint64:
+            # little-endian bytes of the words keep slots in ascending order
+            return slots.astype('<u8').view(np.uint8)
+        if bitpacked and slots.dtype == np.uint8:
+            return slots
+        return None
+    
+    def _get_cmap(self, color_key):
+        """Returns colormap from white to a color of the chart
+
+        Parameters
+        ----------
+        color_key : str
+            key of color in colors
+
+        Returns
+        -------
+        cmap : matplotlib.colors.LinearSegmentedColormap
+            colormap from white to the color
+        """
+        return _get_cmap(self.colors[color_key])
     
     def _plot_events(self, 
                      events, 
@@ -200,24 +404,29 @@ class Chart(object):
             show event label as overlaid text boxed
         ax : matplotlib.axes.Axes
             a `matplotlib.axes.Axes` instance to which the slots are plotted.
-            If not provided, use current axes or create a new one.
-            Optional.
         """
-        if events is None:
+        # events are normalized once, lists and arrays alike
+        if events is None or len(events) == 0:
             return
-        
-        if not ax:
-            ax = plt.gca()
+        events = np.ascontiguousarray(events, dtype=np.int32)
             
         ymin, ymax = ax.get_ylim()
-        ax.vlines(events-.5, ymin, ymax, 
-                  self.colors[color_key], 
-                  linewidth=linewidth)
+        color = self.colors[color_key]
+        events_x = events.astype(np.float32) - .5
+        lines = ax.vlines(events_x, ymin, ymax, 
+                          color, 
+                          linewidth=linewidth)
+        # many events are drawn as one image in vector formats
+        if len(events_x) > 32:
+            lines.set_rasterized(True)
         if show_label:
-            for ix, event in enumerate(events):
-                ax.text(event-.5, ymax, "MS "+str(ix+1), 
-                        color=self.colors[color_key],
-                        bbox={'fc':'white', 'pad':2})
+            # text properties and labels are prepared once for all events,
+            # matplotlib copies the bbox properties per artist
+            bbox = {'fc':'white', 'pad':2}
+            labels = ["MS "+str(ix+1) for ix in range(len(events_x))]
+            ax_text = ax.text
+            for x, text in zip(events_x.tolist(), labels):
+                ax_text(x, ymax, text, color=color, bbox=bbox)
     
     def _plot_slots(self, 
                     data,
@@ -228,14 +437,17 @@ class Chart(object):
                     xlabel=None, 
                     aspect=1., 
                     xticks_steps=1,
-                    ax=None):
+                    ax=None,
+                    x_range=None,
+                    bitpacked=False):
         """Plots temporal interval data into a grid
     
         Parameters
         ----------
         data : array-like
             a 2D numpy array of shape number of representatives (e.g., phases) 
-            x total number of time slots.
+            x total number of time slots. Alternatively, bit-packed as 
+            accepted by plot_gantt.
         color_key : dict
             A dictionary with arguments to `matplotlib.Figure.colorbar`. 
             Optional.
@@ -256,28 +468,54 @@ class Chart(object):
             
         ax : matplotlib.axes.Axes
             a `matplotlib.axes.Axes` instance to which the slots are plotted.
-            If not provided, use current axes or create a new one.
-            Optional.
+        x_range : int
+            total number of time slots, mandatory for bit-packed data
+        bitpacked : boolean, optional
+            whether data of dtype uint8 is bit-packed
         
         """
         if data is None:
             return
-        
-        if not ax:
-            ax = plt.gca()
+
+        packed = self._packed_bytes(data, bitpacked)
+        if packed is not None:
+            # first slot per row: first non-empty byte plus position of its 
+            # lowest set bit, scanning 8 slots per byte
+            first_byte = np.argmax(packed != 0, axis=1)
+            first_bits = packed[np.arange(len(packed)), first_byte]
+            first_slot = first_byte*8 + _FIRST_SET_LUT[first_bits]
+            # rows without any slot are marked with -1
+            text_positions = np.where(first_bits != 0, first_slot, -1)
+            # imshow requires one value per slot
+            data = np.unpackbits(packed, axis=1, count=x_range, 
+                                 bitorder='little').astype(bool)
+        else:
+            # compiled kernel only pays off for wide slot arrays
+            kernel = (_first_true_kernel() 
+                      if HAS_NUMBA and data.size > 1_000_000 else None)
+            if kernel is not None:
+                # rows without any slot are marked with -1
+                text_positions = np.empty(data.shape[0], dtype=np.int64)
+                kernel(np.ascontiguousarray(data), text_positions)
+            else:
+                # argmax returns 0 for rows without any slot, mark them 
+                # with -1
+                text_positions = np.where(data.any(axis=1),
+                                          np.argmax(data, axis=1), -1)
 
         x_max, y_max = data.shape[1], data.shape[0]
         
         ## coloring
-        cell_color = self.colors[color_key]
-        cmap = LinearSegmentedColormap.from_list(
-                                    'mycmap', ['white', cell_color])
+        cmap = self._get_cmap(color_key)
         
         ## plotting slots
         # plot packages as color-filled cells in image grid
-        ax.imshow(data, 
-                  cmap=cmap, interpolation='nearest',
-                  vmin=0, vmax=1, origin='upper', aspect=aspect)
+        im = ax.imshow(data, 
+                       cmap=cmap, interpolation='nearest',
+                       vmin=0, vmax=1, origin='upper', aspect=aspect)
+        # only the cells are rasterized by vector backends, axes and labels
+        # stay vector graphics
+        im.set_rasterized(True)
         
         ## plotting events
         # ymin, ymax = ax.get_ylim()
@@ -290,28 +528,30 @@ class Chart(object):
         
         ## text annotations
         pad_correction = 0.4
-        text_positions = np.argmax(data, axis=1)
-        for y, x in enumerate(text_positions):
-            ax.text(x-pad_correction, y, 
-                    slotlabel+str(y+1), 
-                    va='center', ha='left')
+        # positions and labels are prepared at once, no label for empty rows
+        rows = np.flatnonzero(text_positions >= 0)
+        xs = text_positions[rows].astype(np.float32) - pad_correction
+        labels = [slotlabel+str(y+1) for y in rows.tolist()]
+        ax_text = ax.text
+        for y, x, label in zip(rows.tolist(), xs.tolist(), labels):
+            ax_text(x, y, label, va='center', ha='left')
         # axes annotations
         ax.set_ylabel(ylabel)
         ax.set_xlabel(xlabel)
         
         ## tick appearance
-        # major ticks
-        ax.set_xticks(np.arange(0, x_max, 1))
+        # major ticks in cell centers, minor ticks on cell borders
+        major_x = np.arange(x_max)
+        ax.set_xticks(major_x)
         ax.set_yticks([])
-        # labels for major ticks
-        ax.set_xticklabels(np.arange(1, x_max+1, 1))
-        ax.set_yticklabels([])
-        # minor ticks
-        ax.set_xticks(np.arange(-.5, x_max, 1), minor=True)
-        # hide selected tick labels
+        ax.set_xticks(np.arange(x_max+1) - .5, minor=True)
+        ax.set_yticks(np.arange(y_max+1) - .5, minor=True)
+        # labels for major ticks, selected labels are hidden by leaving them
+        # empty
+        xticklabels = (major_x + 1).astype(str).tolist()
         if xticks_steps > 1:
-            for label in ax.xaxis.get_ticklabels()[::xticks_steps]:
-                label.set_visible(False)
-        ax.set_yticks(np.arange(-.5, y_max, 1), minor=True)
+            xticklabels[::xticks_steps] = [''] * len(
+                                            xticklabels[::xticks_steps])
+        ax.set_xticklabels(xticklabels)
         # gridlines based on minor ticks
         ax.grid(which='minor', color='gray', linestyle='-', linewidth=1)
\ No newline at end of file